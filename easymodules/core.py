@@ -1,6 +1,250 @@
+import contextlib
+import json
+import keyword
+import mmap
 import os
 import pathlib
 import re
+import tempfile
+import threading
+import types
+
+# Regex to tokenise the manual page by utilising the formatting/syntax of manual
+# pages. Matches either a section header (group 1) or a bold name beginning a
+# paragraph (group 2), which is how sub-commands and environment variables are
+# listed. Bytes pattern so that it can be run directly over a memory mapped file
+_MAN_TOKEN_RE = re.compile(rb"^\.S[HS] (.+)$|^\.sp\n\\fB([\w-]+)\\fP", re.MULTILINE)
+# Characters environment variable names are made of
+_ENVVAR_CHARS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ_"
+
+# Headers of the manual sections listing sub-commands and environment variables
+_SUBCMD_HEADER = b"Module Sub\\-Commands"
+_ENV_HEADER = b"ENVIRONMENT"
+
+# Version of the parsed manual cache, to be incremented whenever _scan_man changes
+# so that entries written by an older parser are not reused
+_MAN_CACHE_VERSION = 2
+
+# Sub-commands and environment variables of the module command in v4.3.0. Used
+# when the manual file cannot be found to parse them from
+_DEFAULT_SUB_COMMANDS = (
+    "help",
+    "add",
+    "load",
+    "rm",
+    "unload",
+    "swap",
+    "switch",
+    "show",
+    "display",
+    "list",
+    "avail",
+    "aliases",
+    "use",
+    "unuse",
+    "refresh",
+    "reload",
+    "purge",
+    "clear",
+    "source",
+    "whatis",
+    "apropos",
+    "keyword",
+    "search",
+    "test",
+    "save",
+    "restore",
+    "saverm",
+    "saveshow",
+    "savelist",
+    "initadd",
+    "initprepend",
+    "initrm",
+    "initswitch",
+    "initlist",
+    "initclear",
+    "path",
+    "paths",
+    "config",
+)
+
+_DEFAULT_ENVIRONMENT_VARIABLES = (
+    "LOADEDMODULES",
+    "MODULECONTACT",
+    "MODULEPATH",
+    "MODULERCFILE",
+    "MODULESHOME",
+    "MODULES_AUTO_HANDLING",
+    "MODULES_AVAIL_INDEPTH",
+    "MODULES_CMD",
+    "MODULES_COLLECTION_PIN_VERSION",
+    "MODULES_COLLECTION_TARGET",
+    "MODULES_COLOR",
+    "CLICOLOR",
+    "MODULES_COLORS",
+    "MODULES_IMPLICIT_DEFAULT",
+    "MODULES_LMALTNAME",
+    "MODULES_LMCONFLICT",
+    "MODULES_LMNOTUASKED",
+    "MODULES_LMPREREQ",
+    "MODULES_PAGER",
+    "MODULES_RUN_QUARANTINE",
+    "MODULES_SEARCH_MATCH",
+    "MODULES_SET_SHELL_STARTUP",
+    "MODULES_SILENT_SHELL_DEBUG",
+    "MODULES_SITECONFIG",
+    "MODULES_TERM_BACKGROUND",
+    "MODULES_UNLOAD_MATCH_ORDER",
+    "MODULES_USE_COMPAT_VERSION",
+    "MODULES_VERBOSITY",
+    "_LMFILES_",
+)
+
+
+# Functions generated by _sub_command_function, keyed by sub-command
+_SUB_COMMAND_FUNCTIONS = {}
+
+
+def _sub_command_function(name: str):
+    """
+    Generate a function running the sub-command name, to be bound to a Module.
+
+    The function is named after the sub-command for tracebacks and introspection and
+    passes name as a constant. Functions are generated once per sub-command.
+    """
+    function = _SUB_COMMAND_FUNCTIONS.get(name)
+    if function is None:
+        # Sub-commands such as those containing hyphens are not valid function names
+        if name.isidentifier() and not keyword.iskeyword(name):
+            function_name = name
+        else:
+            function_name = "sub_command"
+        source = (
+            f"def {function_name}(self, *args, **kwargs):\n"
+            f"    return self.module({name!r}, *args, **kwargs)\n"
+        )
+        namespace = {}
+        exec(source, namespace)
+        function = namespace[function_name]
+        function.__qualname__ = f"Module.{function_name}"
+        _SUB_COMMAND_FUNCTIONS[name] = function
+    return function
+
+
+@contextlib.contextmanager
+def _open_man(man_file: os.PathLike):
+    """
+    Memory map the manual file read-only, yielding a bytes-like buffer.
+    """
+    with open(man_file, "rb") as f:
+        # Empty files cannot be memory mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _scan_man(man):
+    """
+    Scan the manual file for sub-commands and environment variables in a single pass.
+
+    Returns
+    -------
+    tuple
+        Tuples of the sub-commands and environment variables.
+    """
+    sub_commands = []
+    environment_variables = []
+    section = None
+    for header, name in _MAN_TOKEN_RE.findall(man):
+        if header:
+            section = header
+        elif section == _SUBCMD_HEADER:
+            sub_commands.append(name.decode("ascii"))
+        # Deleting the valid characters leaves nothing of a valid name
+        elif section == _ENV_HEADER and not name.translate(None, _ENVVAR_CHARS):
+            environment_variables.append(name.decode("ascii"))
+    return tuple(sub_commands), tuple(environment_variables)
+
+
+def _man_cache_file():
+    """Path to the on-disk cache of parsed manual files."""
+    # An empty XDG_CACHE_HOME is treated as unset
+    cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache_home) / "easymodules" / "manparse.json"
+
+
+def _man_cache_disabled():
+    """
+    Whether the man cache is disabled through EASYMODULES_DISABLE_CACHE.
+
+    Unset, empty and the usual false values (0, false, no, off) leave it enabled.
+    """
+    value = os.environ.get("EASYMODULES_DISABLE_CACHE", "")
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def _load_man_cache(key: str):
+    """
+    Load the parsed manual entry stored under key.
+
+    Returns None if caching is disabled through EASYMODULES_DISABLE_CACHE or
+    no valid entry exists.
+    """
+    if _man_cache_disabled():
+        return None
+    try:
+        with open(_man_cache_file(), "r") as f:
+            entry = json.load(f).get(key)
+    except (OSError, ValueError, AttributeError, KeyError, RuntimeError):
+        # KeyError and RuntimeError if the home directory cannot be determined
+        return None
+    if not isinstance(entry, dict):
+        return None
+    for field in ("sub_commands", "environment_variables"):
+        names = entry.get(field)
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            return None
+    return entry
+
+
+def _save_man_cache(key: str, data: dict):
+    """
+    Store the parsed manual entry data under key.
+
+    The cache is best effort, failing to write it is silently ignored. The file is
+    replaced atomically so that concurrent processes never read a partial file.
+    """
+    if _man_cache_disabled():
+        return
+    try:
+        cache_file = _man_cache_file()
+    except (KeyError, RuntimeError):
+        # The home directory cannot be determined
+        return
+    try:
+        with open(cache_file, "r") as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    cache[key] = data
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(
+            dir=cache_file.parent, prefix=".manparse-", suffix=".json"
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_file)
 
 
 class Module:
@@ -38,96 +282,35 @@ class Module:
     /opt/Modules/v4.3.0/libexec/modulecmd.tcl
     
     """
-        
-    sub_commands = [
-        "help",
-        "add",
-        "load",
-        "rm",
-        "unload",
-        "swap",
-        "switch",
-        "show",
-        "display",
-        "list",
-        "avail",
-        "aliases",
-        "use",
-        "unuse",
-        "refresh",
-        "reload",
-        "purge",
-        "clear",
-        "source",
-        "whatis",
-        "apropos",
-        "keyword",
-        "search",
-        "test",
-        "save",
-        "restore",
-        "saverm",
-        "saveshow",
-        "savelist",
-        "initadd",
-        "initprepend",
-        "initrm",
-        "initswitch",
-        "initlist",
-        "initclear",
-        "path",
-        "paths",
-        "config",
-    ]
-    """
-    list: List of sub-commands that may be run by the module environment.
-    
-    The default list contains those that exist in v4.3.0. 
-    The list may be updated using `parse_man_file`.
-    See `Examples` for how to invoke a specific command as if it were a class
-    method.
-    """
-    
-    environment_variables = [
-        "LOADEDMODULES",
-        "MODULECONTACT",
-        "MODULEPATH",
-        "MODULERCFILE",
-        "MODULESHOME",
-        "MODULES_AUTO_HANDLING",
-        "MODULES_AVAIL_INDEPTH",
-        "MODULES_CMD",
-        "MODULES_COLLECTION_PIN_VERSION",
-        "MODULES_COLLECTION_TARGET",
-        "MODULES_COLOR",
-        "CLICOLOR",
-        "MODULES_COLORS",
-        "MODULES_IMPLICIT_DEFAULT",
-        "MODULES_LMALTNAME",
-        "MODULES_LMCONFLICT",
-        "MODULES_LMNOTUASKED",
-        "MODULES_LMPREREQ",
-        "MODULES_PAGER",
-        "MODULES_RUN_QUARANTINE",
-        "MODULES_SEARCH_MATCH",
-        "MODULES_SET_SHELL_STARTUP",
-        "MODULES_SILENT_SHELL_DEBUG",
-        "MODULES_SITECONFIG",
-        "MODULES_TERM_BACKGROUND",
-        "MODULES_UNLOAD_MATCH_ORDER",
-        "MODULES_USE_COMPAT_VERSION",
-        "MODULES_VERBOSITY",
-        "_LMFILES_",
-    ]
-    """
-    list: List of environment variables that may be set by the module environment.
-    
-    The default list contains those that exist in v4.3.0. 
-    The list may be updated using `parse_man_file`.
-    See `Examples` for how to access the values of these variables through `environ`.
-    """
+
+    __slots__ = (
+        "modules_home",
+        "init_file",
+        "_default_man_file",
+        "module",
+        "_sub_commands",
+        "_sub_commands_set",
+        "_environment_variables",
+        "_wrapper_cache",
+        "__weakref__",
+    )
+
+    # Namespaces of executed module initialisation scripts, keyed by
+    # (path, modification time)
+    _init_cache = {}
+    _init_lock = threading.Lock()
+    # Initialisation files found by set_init_file, keyed by (modules_home, modification time)
+    _init_path_cache = {}
 
     def __init__(self, home: os.PathLike = None, init_file: os.PathLike = None):
+        # Populated from the manual file on first use, see the sub_commands and
+        # environment_variables properties
+        self._sub_commands = None
+        self._sub_commands_set = None
+        self._environment_variables = None
+        # Sub-command wrappers returned by __getattr__
+        self._wrapper_cache = {}
+
         if home is not None:
             self.modules_home = pathlib.Path(home)
         else:
@@ -137,20 +320,38 @@ class Module:
                 raise ValueError(
                     "Cannot automatically set modules_home. Environment variable MODULESHOME unset. Pass module home directory to Module"
                 )
+        # Standard manual file location
+        self._default_man_file = self.modules_home / "share" / "man" / "man1" / "module.1"
 
         # Attempts to find the init file based on modules_home
         self.set_init_file(init_file)
 
-        # Initialise modules command, variables from init script are saved into global
-        # scope here
-        with open(self.init_file, "r") as f:
-            exec(f.read(), globals())
+        # Initialise modules command, the init script is executed into its own namespace
+        namespace = type(self)._load_init(self.init_file)
         # Grabbing the resulting module function
         try:
-            self.module = globals()["module"]
+            self.module = namespace["module"]
         except KeyError:
             raise EnvironmentError("The module environment could not be initialised.")
 
+    @classmethod
+    def _load_init(cls, path: os.PathLike):
+        """
+        Execute the initialisation file into a namespace shared across instances.
+
+        The file is only executed again if it has been modified.
+        """
+        key = (str(path), os.stat(path).st_mtime_ns)
+        with cls._init_lock:
+            namespace = cls._init_cache.get(key)
+            if namespace is None:
+                with open(path, "r") as f:
+                    code = compile(f.read(), str(path), "exec")
+                namespace = {}
+                exec(code, namespace)
+                cls._init_cache[key] = namespace
+        return namespace
+
     def set_init_file(self, init_file: os.PathLike = None):
         """
         Set the path to the module initialisation file.
@@ -177,8 +378,23 @@ class Module:
                 )
             return
 
-        # Double asterisk glob allows the init directory to be buried within the directory tree
-        possible_init_files = list(self.modules_home.glob("**/init/*python*.py"))
+        # Reuse the result of a previous search unless modules_home has changed.
+        # If modules_home cannot be stat'd, the search below reports the error
+        try:
+            key = (str(self.modules_home), self.modules_home.stat().st_mtime_ns)
+        except OSError:
+            key = None
+        cached = type(self)._init_path_cache.get(key)
+        if cached is not None and cached.exists():
+            self.init_file = cached
+            return
+
+        # Check the common layouts first, falling back to a double asterisk glob
+        # which allows the init directory to be buried within the directory tree
+        for pattern in ("init/*python*.py", "*/init/*python*.py", "**/init/*python*.py"):
+            possible_init_files = list(self.modules_home.glob(pattern))
+            if possible_init_files:
+                break
 
         if len(possible_init_files) == 0:
             raise FileNotFoundError("Modules initialisation file could not be found. ")
@@ -189,20 +405,69 @@ class Module:
             )
 
         self.init_file = possible_init_files[0]
+        if key is not None:
+            type(self)._init_path_cache[key] = self.init_file
 
     def parse_man_file(self, man_file: os.PathLike = None):
         """
         Parse the module manual file for available module sub-commands and environment variables.
 
+        Both are otherwise parsed the first time either is accessed, so this is only needed
+        to refresh them or to parse a non-standard manual file.
         The manual file is generally located in the module home directory in a file called module.1
 
+        Parsed results are cached on disk under $XDG_CACHE_HOME/easymodules, or
+        ~/.cache/easymodules if XDG_CACHE_HOME is unset, and reused until the manual file
+        changes. Set EASYMODULES_DISABLE_CACHE to a true value (eg. 1) to bypass the cache.
+
         Parameters
         ----------
         man_file : os.PathLike, optional
             Path to the manual file, by default None
         """
-        self.get_sub_commands(man_file)
-        self.get_environment_variables(man_file)
+        sub_commands, self._environment_variables = self._read_man_file(man_file)
+        self._set_sub_commands(sub_commands)
+
+    def _read_man_file(self, man_file: os.PathLike = None):
+        """
+        Scan the manual file, reusing the on-disk cache if the file is unchanged.
+
+        Returns
+        -------
+        tuple
+            Tuples of the sub-commands and environment variables.
+        """
+        man_file = self._man_file_path(man_file)
+        stat = os.stat(man_file)
+        key = (
+            f"{_MAN_CACHE_VERSION}:{os.path.abspath(man_file)}:"
+            f"{stat.st_mtime_ns}:{stat.st_size}"
+        )
+        cached = _load_man_cache(key)
+        if cached is not None:
+            return (
+                tuple(cached["sub_commands"]),
+                tuple(cached["environment_variables"]),
+            )
+
+        with _open_man(man_file) as man:
+            sub_commands, environment_variables = _scan_man(man)
+        _save_man_cache(
+            key,
+            {
+                "sub_commands": sub_commands,
+                "environment_variables": environment_variables,
+            },
+        )
+        return sub_commands, environment_variables
+
+    def _man_file_path(self, man_file: os.PathLike = None):
+        """
+        Path to the manual file, defaulting to the standard location within modules_home.
+        """
+        if man_file is None:
+            return self._default_man_file
+        return man_file
 
     def get_sub_commands(self, man_file: os.PathLike = None):
         """
@@ -215,25 +480,44 @@ class Module:
         man_file : os.PathLike, optional
             Path to the manual file, by default None
         """
+        with _open_man(self._man_file_path(man_file)) as man:
+            sub_commands, _ = _scan_man(man)
+        self._set_sub_commands(sub_commands)
 
-        # Standard manual file location
-        if man_file is None:
-            man_file = os.path.join(
-                self.modules_home, "share", "man", "man1", "module.1"
-            )
+    def _set_sub_commands(self, sub_commands: tuple):
+        """
+        Replace the sub-commands, keeping the lookup set in sync.
+        """
+        # Clear wrappers cached by __getattr__ for the old sub-commands
+        self._wrapper_cache.clear()
 
-        with open(man_file, "r") as f:
-            man = f.read()
+        self._sub_commands = sub_commands
+        self._sub_commands_set = frozenset(sub_commands)
 
-        # Find section of manual re. sub-commands
-        start = man.find(".SS Module Sub\-Commands")
-        end = start + man[start + 3 :].find(".SS") + 1
+    def _load_sub_commands(self):
+        """
+        Parse the sub-commands from the standard manual file if not yet done.
+        """
+        if self._sub_commands is None:
+            self._load_man_file()
 
-        sub_commands_section = man[start:end]
+    def _load_man_file(self):
+        """
+        Set the sub-commands and environment variables not yet set from the standard manual file.
 
-        # Regex to extract the subcommands by utilising the formatting/syntax of
-        # manual pages
-        self.sub_commands = re.findall(r".sp\n\\fB([\w|-]+)\\fP", sub_commands_section)
+        Falls back to those of v4.3.0 if the manual file cannot be read or lists none, for
+        example if its entries are not formatted as expected.
+        """
+        try:
+            sub_commands, environment_variables = self._read_man_file()
+        except OSError:
+            sub_commands, environment_variables = (), ()
+        if self._sub_commands is None:
+            self._set_sub_commands(sub_commands or _DEFAULT_SUB_COMMANDS)
+        if self._environment_variables is None:
+            self._environment_variables = (
+                environment_variables or _DEFAULT_ENVIRONMENT_VARIABLES
+            )
 
     def get_environment_variables(self, man_file: os.PathLike = None):
         """
@@ -246,25 +530,8 @@ class Module:
         man_file : os.PathLike, optional
             Path to the manual file, by default None
         """
-        # Standard manual file location
-        if man_file is None:
-            man_file = os.path.join(
-                self.modules_home, "share", "man", "man1", "module.1"
-            )
-
-        with open(man_file, "r") as f:
-            man = f.read()
-
-        start = man.find(".SH ENVIRONMENT")
-        end = start + man[start + 3 :].find("\n.S") + 1
-
-        environment_vars_section = man[start:end]
-
-        # Regex to extract the environment variables by utilising the formatting/syntax of
-        # manual pages
-        self.envinronment_variables = re.findall(
-            r".sp\n\\fB([A-Z|-|_]+)\\fP", environment_vars_section
-        )
+        with _open_man(self._man_file_path(man_file)) as man:
+            _, self._environment_variables = _scan_man(man)
 
     def __getattr__(self, _name):
         """
@@ -273,17 +540,65 @@ class Module:
         """
         # __getattr__ is only called if _name is not already an attribute of
         # the class.
-        # First check if the attribute is in the list of sub-commands.
-        if _name in self.sub_commands:
-            # Have to return a wrapper function so that args and kwargs
-            # can be passed through
-            def wrapper(*args, **kwargs):
-                return self.module(_name, *args, **kwargs)
-
+        # Python frequently probes for optional dunder methods, none of which
+        # are sub-commands. Private names are rejected too, as an unset slot
+        # would otherwise recurse back into __getattr__.
+        if _name.startswith("_"):
+            raise AttributeError(_name)
+        try:
+            return self._wrapper_cache[_name]
+        except KeyError:
+            pass
+        # First check if the attribute is in the set of sub-commands.
+        self._load_sub_commands()
+        if _name in self._sub_commands_set:
+            # Bind the generated function so that it is called like a method
+            wrapper = types.MethodType(_sub_command_function(_name), self)
+            self._wrapper_cache[_name] = wrapper
             return wrapper
         else:
             raise AttributeError("Module has no such attribute %s" % _name)
 
+    @property
+    def sub_commands(self):
+        """
+        tuple: Sub-commands that may be run by the module environment.
+
+        Parsed from the manual file on first access, or the sub-commands of v4.3.0 if the
+        manual file cannot be read or lists none. May be refreshed using `parse_man_file`.
+        See `Examples` for how to invoke a specific command as if it were a class method.
+        """
+        self._load_sub_commands()
+        return self._sub_commands
+
+    @sub_commands.setter
+    def sub_commands(self, sub_commands: tuple):
+        self._set_sub_commands(tuple(sub_commands))
+
+    @property
+    def environment_variables(self):
+        """
+        tuple: Environment variables that may be set by the module environment.
+
+        Parsed from the manual file on first access, or the environment variables of v4.3.0
+        if the manual file cannot be read or lists none. May be refreshed using `parse_man_file`.
+        See `Examples` for how to access the values of these variables through `environ`.
+        """
+        if self._environment_variables is None:
+            self._load_man_file()
+        return self._environment_variables
+
+    @environment_variables.setter
+    def environment_variables(self, environment_variables: tuple):
+        self._environment_variables = tuple(environment_variables)
+
+    @property
+    def envinronment_variables(self):
+        """
+        tuple: Read-only alias of `environment_variables`, kept for backwards compatibility.
+        """
+        return self.environment_variables
+
     @property
     def environ(self):
         """
@@ -293,8 +608,11 @@ class Module:
         from the dict, they are either unset or missing from self.environment_variables. The
         latter can be updated using self.get_environment_variables.
         """
-        return {
-            var: os.environ[var]
-            for var in self.envinronment_variables
-            if os.environ.get(var) is not None
-        }
+        # A single lookup per variable, os.environ.get encodes the key each call
+        get = os.environ.get
+        environ = {}
+        for var in self.environment_variables:
+            value = get(var)
+            if value is not None:
+                environ[var] = value
+        return environ